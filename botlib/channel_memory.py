@@ -8,7 +8,7 @@ import re
 
 from firebase_admin import firestore
 
-from .firestore_keys import _init_firebase
+from .firestore_keys import _firestore_client
 
 
 @dataclass(frozen=True)
@@ -39,8 +39,7 @@ class FirestoreChannelMemoryStore:
         prefix: str = "channel_memory_",
         recent_subcollection: str = "recent_messages",
     ) -> None:
-        _init_firebase(credentials_path=credentials_path)
-        self._db = firestore.client()
+        self._db = _firestore_client(credentials_path=credentials_path)
         self._collection = collection
         self._bot_key = self._sanitize_bot_key(bot_key)
         self._prefix = prefix
@@ -131,12 +130,12 @@ class FirestoreChannelMemoryStore:
         summary = data.get("summary") if isinstance(data.get("summary"), str) else ""
         cutoff_message_id = data.get("cutoff_message_id") if isinstance(data.get("cutoff_message_id"), int) else None
 
-        # Fetch recent messages ordered by id.
-        query = (
-            self._recent_ref(guild_id=guild_id, channel_id=channel_id, user_id=user_id)
-            .order_by("message_id", direction=firestore.Query.ASCENDING)
-            .limit_to_last(int(recent_limit))
-        )
+        # Fetch recent messages ordered by id. Messages at/before a reset cutoff are filtered
+        # server-side so they never leave Firestore.
+        query = self._recent_ref(guild_id=guild_id, channel_id=channel_id, user_id=user_id)
+        if cutoff_message_id is not None:
+            query = query.where("message_id", ">", cutoff_message_id)
+        query = query.order_by("message_id", direction=firestore.Query.ASCENDING).limit_to_last(int(recent_limit))
         docs = list(query.stream())
 
         recent: list[dict[str, Any]] = []
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-import json
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Iterable, Optional
 
 import httpx
 
+from . import fast_json
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class ElevenLabsAuthError(RuntimeError):
     pass
@@ -19,6 +28,14 @@ class ElevenLabsServerError(RuntimeError):
     pass
 
 
+class ElevenLabsRequestError(RuntimeError):
+    """Non-retryable 4xx (bad voice_id, bad text, ...); another key won't help."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(f"Request rejected ({status_code}): {detail}")
+        self.status_code = status_code
+
+
 @dataclass(frozen=True)
 class ElevenLabsVoiceSettings:
     stability: float = 0.5
@@ -44,17 +61,83 @@ class ElevenLabsTTSRequest:
     voice_settings: Optional[ElevenLabsVoiceSettings] = None
 
 
+_eleven_client: httpx.AsyncClient | None = None
+
+
+def _get_eleven_client() -> httpx.AsyncClient:
+    """Return the process-wide ElevenLabs client (keeps TLS connections warm between calls)."""
+
+    global _eleven_client
+    if _eleven_client is None or _eleven_client.is_closed:
+        _eleven_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _eleven_client
+
+
+async def close_eleven_client() -> None:
+    global _eleven_client
+    client, _eleven_client = _eleven_client, None
+    if client is not None:
+        await client.aclose()
+
+
+_RETRYABLE_ERRORS = (ElevenLabsAuthError, ElevenLabsRateLimitError, ElevenLabsServerError, httpx.TransportError)
+
+
+async def _tts_once(
+    client: httpx.AsyncClient,
+    *,
+    url: str,
+    api_key: str,
+    body: bytes,
+    timeout_s: float,
+) -> bytes:
+    async with client.stream(
+        "POST",
+        url,
+        headers={
+            "xi-api-key": api_key,
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+        },
+        content=body,
+        timeout=timeout_s,
+    ) as resp:
+        # Status checks happen before the body is downloaded.
+        if resp.status_code in (401, 403):
+            raise ElevenLabsAuthError(f"Auth failed ({resp.status_code})")
+        if resp.status_code == 429:
+            raise ElevenLabsRateLimitError("Rate limited (429)")
+        if resp.status_code >= 500:
+            raise ElevenLabsServerError(f"Server error ({resp.status_code})")
+
+        if resp.status_code >= 400:
+            err_body = await resp.aread()
+            detail = err_body[:200].decode("utf-8", errors="replace").strip()
+            raise ElevenLabsRequestError(resp.status_code, detail)
+
+        return await resp.aread()
+
+
 async def tts_with_key_rotation(
     *,
     api_keys: Iterable[str],
     req: ElevenLabsTTSRequest,
     api_base: str = "https://api.elevenlabs.io",
     timeout_s: float = 60.0,
+    max_concurrency: int = 1,
 ) -> bytes:
     """Call ElevenLabs TTS with key rotation.
 
-    Tries keys in order; rotates on auth/rate-limit/server errors.
+    Tries keys in order; rotates on auth/rate-limit/server/network errors.
+    Other 4xx responses raise ElevenLabsRequestError immediately.
     Returns raw audio bytes.
+
+    With max_concurrency > 1, keys are raced in groups of that size: the first success
+    wins and the rest of the group is cancelled. Note that a cancelled request may still
+    have been billed by ElevenLabs, which is why the default stays sequential.
     """
 
     voice_id = (req.voice_id or "").strip()
@@ -74,38 +157,44 @@ async def tts_with_key_rotation(
     }
     if req.voice_settings is not None:
         payload["voice_settings"] = req.voice_settings.to_dict()
+    # Encoded once and reused for every key attempt.
+    body = fast_json.dumps(payload)
 
+    keys = [k.strip() for k in api_keys if k and k.strip()]
+    client = _get_eleven_client()
     last_error: Exception | None = None
 
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
-        for api_key in api_keys:
-            api_key = (api_key or "").strip()
-            if not api_key:
-                continue
-
+    if max_concurrency <= 1 or len(keys) <= 1:
+        for api_key in keys:
             try:
-                resp = await client.post(
-                    url,
-                    headers={
-                        "xi-api-key": api_key,
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                    },
-                    json=payload,
-                )
-
-                if resp.status_code in (401, 403):
-                    raise ElevenLabsAuthError(f"Auth failed ({resp.status_code})")
-                if resp.status_code == 429:
-                    raise ElevenLabsRateLimitError("Rate limited (429)")
-                if resp.status_code >= 500:
-                    raise ElevenLabsServerError(f"Server error ({resp.status_code})")
-
-                resp.raise_for_status()
-                return resp.content
-
-            except (ElevenLabsAuthError, ElevenLabsRateLimitError, ElevenLabsServerError, httpx.HTTPError, json.JSONDecodeError) as exc:
+                return await _tts_once(client, url=url, api_key=api_key, body=body, timeout_s=timeout_s)
+            except _RETRYABLE_ERRORS as exc:
                 last_error = exc
                 continue
 
+        raise RuntimeError(f"All ElevenLabs API keys failed; last error: {last_error!r}")
+
+    for start in range(0, len(keys), max_concurrency):
+        pending = {
+            asyncio.create_task(_tts_once(client, url=url, api_key=api_key, body=body, timeout_s=timeout_s))
+            for api_key in keys[start : start + max_concurrency]
+        }
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Retrieve every outcome first so no finished task's exception goes unobserved.
+                outcomes = [(task, task.exception()) for task in done]
+                for task, exc in outcomes:
+                    if exc is None:
+                        return task.result()
+                for _, exc in outcomes:
+                    if not isinstance(exc, _RETRYABLE_ERRORS):
+                        raise exc
+                    last_error = exc
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
     raise RuntimeError(f"All ElevenLabs API keys failed; last error: {last_error!r}")
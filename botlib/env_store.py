@@ -1,8 +1,18 @@
 from __future__ import annotations
 
+import io
+import os
+import re
+import tempfile
 from pathlib import Path
 from typing import Iterable
 
+from dotenv import dotenv_values
+
+
+# key -> compiled pattern matching its first `KEY=...` line (including the line ending).
+_ASSIGNMENT_RE_CACHE: dict[str, re.Pattern[str]] = {}
+
 
 def _split_csv(value: str) -> list[str]:
     items: list[str] = []
@@ -35,42 +45,62 @@ def load_key_list_from_env(env: dict[str, str]) -> list[str]:
     return deduped
 
 
+def _assignment_re(key: str) -> re.Pattern[str]:
+    rx = _ASSIGNMENT_RE_CACHE.get(key)
+    if rx is None:
+        rx = re.compile(rf"^[ \t]*{re.escape(key)} ?=.*(?:\r?\n|$)", re.MULTILINE)
+        _ASSIGNMENT_RE_CACHE[key] = rx
+    return rx
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        if path.exists():
+            # mkstemp creates 0600 files; keep the original permissions.
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _upsert_in_text(text: str, key: str, value: str) -> str:
+    replacement = f"{key}={value}\n"
+
+    # Use a function replacement so backslashes in `value` are kept literally.
+    text, n = _assignment_re(key).subn(lambda _m: replacement, text, count=1)
+    if not n:
+        if text and not text.endswith("\n"):
+            text += "\n"
+        text += replacement
+    return text
+
+
 def upsert_env_var(env_path: Path, key: str, value: str) -> None:
     """Update or append `key=value` in .env.
 
     Preserves unrelated lines; replaces the first matching assignment.
+    The file is rewritten atomically.
     """
 
     env_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if env_path.exists():
-        lines = env_path.read_text(encoding="utf-8").splitlines(keepends=True)
-    else:
-        lines = []
-
-    def is_assignment_line(line: str) -> bool:
-        stripped = line.strip()
-        return stripped.startswith(f"{key}=") or stripped.startswith(f"{key} =")
-
-    replacement = f"{key}={value}\n"
-
-    for i, line in enumerate(lines):
-        if is_assignment_line(line):
-            lines[i] = replacement
-            env_path.write_text("".join(lines), encoding="utf-8")
-            return
-
-    if lines and not lines[-1].endswith("\n"):
-        lines[-1] = lines[-1] + "\n"
-
-    lines.append(replacement)
-    env_path.write_text("".join(lines), encoding="utf-8")
+    text = env_path.read_text(encoding="utf-8") if env_path.exists() else ""
+    _write_text_atomic(env_path, _upsert_in_text(text, key, value))
 
 
 def add_api_keys(env_path: Path, *, new_keys: Iterable[str]) -> list[str]:
-    from dotenv import dotenv_values
+    env_path.parent.mkdir(parents=True, exist_ok=True)
 
-    env = {k: (v or "") for k, v in dotenv_values(env_path).items() if k}
+    # Read once: parse the in-memory text, then upsert into that same text and write once.
+    text = env_path.read_text(encoding="utf-8") if env_path.exists() else ""
+    env = {k: (v or "") for k, v in dotenv_values(stream=io.StringIO(text)).items() if k}
     existing = load_key_list_from_env(env)
 
     merged: list[str] = []
@@ -81,5 +111,5 @@ def add_api_keys(env_path: Path, *, new_keys: Iterable[str]) -> list[str]:
             seen.add(key)
             merged.append(key)
 
-    upsert_env_var(env_path, "OLLAMA_API_KEYS", ",".join(merged))
+    _write_text_atomic(env_path, _upsert_in_text(text, "OLLAMA_API_KEYS", ",".join(merged)))
     return merged
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is always available
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str.
+
+    Uses `orjson` when installed. Raises `ValueError` (json.JSONDecodeError or
+    orjson.JSONDecodeError, both subclasses) on invalid input.
+    """
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -2,16 +2,24 @@ from __future__ import annotations
 
 import hashlib
 import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
 
+_T = TypeVar("_T")
+
+# Each key entry carries a SERVER_TIMESTAMP transform; keep single writes well under
+# Firestore's 500 writes/transforms per commit.
+_MAX_FIELDS_PER_WRITE = 400
+
 _init_lock = threading.Lock()
 _app_inited = False
+_client: Any = None
 
 
 def _init_firebase(*, credentials_path: Path) -> None:
@@ -26,8 +34,36 @@ def _init_firebase(*, credentials_path: Path) -> None:
         _app_inited = True
 
 
-def _sha256_hex(value: str) -> str:
-    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+def _firestore_client(*, credentials_path: Path) -> Any:
+    """Initialize Firebase if needed and return the process-wide Firestore client."""
+
+    global _client
+    if _client is not None:
+        return _client
+    _init_firebase(credentials_path=credentials_path)
+    with _init_lock:
+        if _client is None:
+            _client = firestore.client()
+    return _client
+
+
+def _sha256_kid(value: str) -> str:
+    """Stable 24-hex-char key id (first 12 bytes of SHA-256)."""
+
+    return hashlib.sha256(value.encode("utf-8")).digest()[:12].hex()
+
+
+def _dot_to_nested(update: dict[str, Any]) -> dict[str, Any]:
+    """Expand dotted field paths ({"a.b": v}) into nested dicts ({"a": {"b": v}}) for set(merge=True)."""
+
+    nested: dict[str, Any] = {}
+    for path, value in update.items():
+        *parents, leaf = path.split(".")
+        node = nested
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    return nested
 
 
 @dataclass(frozen=True)
@@ -46,13 +82,54 @@ class FirestoreKeyStore:
         credentials_path: Path,
         collection: str,
         doc_id: str = "admin_keys",
+        cache_ttl_s: float = 30.0,
     ) -> None:
-        _init_firebase(credentials_path=credentials_path)
-        self._db = firestore.client()
+        self._db = _firestore_client(credentials_path=credentials_path)
         self._doc_ref = self._db.collection(collection).document(doc_id)
 
-    def list_api_keys(self) -> list[str]:
-        snap = self._doc_ref.get()
+        # Short-lived read cache: bots read keys/model on every reply. Writes made through this
+        # store invalidate immediately; writes from other processes show up within the TTL.
+        self._cache_ttl_s = float(cache_ttl_s)
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, key: str, loader: Callable[[], _T], *, fresh: bool = False) -> _T:
+        # fresh=True skips the cached value but still stores the newly loaded one.
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if not fresh and hit is not None and (now - hit[0]) < self._cache_ttl_s:
+            return hit[1]
+
+        value = loader()
+        with self._cache_lock:
+            self._cache[key] = (now, value)
+        return value
+
+    def _invalidate(self, *keys: str) -> None:
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def _merge_in_chunks(self, update: dict[str, Any]) -> None:
+        # set(merge=True) creates the doc if needed, so each write is a single RPC.
+        if len(update) <= _MAX_FIELDS_PER_WRITE:
+            self._doc_ref.set(_dot_to_nested(update), merge=True)
+            return
+
+        # Large imports: split across batches. These are committed one after another since
+        # they all target the same document (concurrent commits would just contend).
+        items = list(update.items())
+        for start in range(0, len(items), _MAX_FIELDS_PER_WRITE):
+            batch = self._db.batch()
+            batch.set(self._doc_ref, _dot_to_nested(dict(items[start : start + _MAX_FIELDS_PER_WRITE])), merge=True)
+            batch.commit()
+
+    def list_api_keys(self, *, fresh: bool = False) -> list[str]:
+        return self._cached("keys", self._load_api_keys, fresh=fresh)
+
+    def _load_api_keys(self) -> list[str]:
+        snap = self._doc_ref.get(field_paths=["keys"])
         if not snap.exists:
             return []
         data = snap.to_dict() or {}
@@ -61,11 +138,14 @@ class FirestoreKeyStore:
             return []
 
         out: list[str] = []
-        for _, entry in keys.items():
-            if isinstance(entry, dict):
-                api_key = entry.get("api_key")
-                if isinstance(api_key, str) and api_key.strip():
-                    out.append(api_key.strip())
+        for entry in keys.values():
+            if type(entry) is not dict:
+                continue
+            api_key = entry.get("api_key")
+            if type(api_key) is str:
+                api_key = api_key.strip()
+                if api_key:
+                    out.append(api_key)
 
         # De-dup preserve order
         seen: set[str] = set()
@@ -76,13 +156,17 @@ class FirestoreKeyStore:
                 deduped.append(k)
         return deduped
 
-    def list_elevenlabs_api_keys(self) -> list[str]:
+    def list_elevenlabs_api_keys(self, *, fresh: bool = False) -> list[str]:
         """List ElevenLabs API keys stored in Firestore.
 
-        Stored separately from Ollama keys to avoid mixing providers.
+        Stored separately from Ollama keys to avoid mixing providers. Pass `fresh=True` to
+        bypass the read cache.
         """
 
-        snap = self._doc_ref.get()
+        return self._cached("elevenlabs_keys", self._load_elevenlabs_api_keys, fresh=fresh)
+
+    def _load_elevenlabs_api_keys(self) -> list[str]:
+        snap = self._doc_ref.get(field_paths=["elevenlabs_keys"])
         if not snap.exists:
             return []
 
@@ -92,11 +176,14 @@ class FirestoreKeyStore:
             return []
 
         out: list[str] = []
-        for _, entry in keys.items():
-            if isinstance(entry, dict):
-                api_key = entry.get("api_key")
-                if isinstance(api_key, str) and api_key.strip():
-                    out.append(api_key.strip())
+        for entry in keys.values():
+            if type(entry) is not dict:
+                continue
+            api_key = entry.get("api_key")
+            if type(api_key) is str:
+                api_key = api_key.strip()
+                if api_key:
+                    out.append(api_key)
 
         seen: set[str] = set()
         deduped: list[str] = []
@@ -118,8 +205,11 @@ class FirestoreKeyStore:
         if not cleaned:
             return {"added": 0, "skipped": 0, "total": len(self.list_api_keys())}
 
-        # Read existing keys once so we can skip true duplicates.
-        existing_snap = self._doc_ref.get()
+        # Key ids are pure functions of the input; compute them before the Firestore read.
+        pairs = [(api_key, _sha256_kid(api_key)) for api_key in cleaned]
+
+        # Read existing keys once so we can skip true duplicates (field mask: only the `keys` map).
+        existing_snap = self._doc_ref.get(field_paths=["keys"])
         existing_data = existing_snap.to_dict() if existing_snap.exists else {}
         existing_keys = existing_data.get("keys") if isinstance(existing_data, dict) else None
         existing_key_ids: set[str] = set(existing_keys.keys()) if isinstance(existing_keys, dict) else set()
@@ -128,8 +218,7 @@ class FirestoreKeyStore:
         # If the ID already exists, skip (prevents needless rewrites and duplicates).
         update: dict[str, Any] = {}
         skipped = 0
-        for api_key in cleaned:
-            kid = _sha256_hex(api_key)[:24]
+        for api_key, kid in pairs:
             if kid in existing_key_ids:
                 skipped += 1
                 continue
@@ -142,11 +231,11 @@ class FirestoreKeyStore:
             }
 
         if update:
-            # Ensure doc exists; set merge also works.
-            self._doc_ref.set({}, merge=True)
-            self._doc_ref.update(update)
+            self._merge_in_chunks(update)
+            self._invalidate("keys")
 
-        total = len(self.list_api_keys())
+        # Derive the total from the snapshot we already read instead of fetching the doc again.
+        total = len(existing_key_ids) + len(update)
         return {"added": len(update), "skipped": skipped, "total": total}
 
     def add_elevenlabs_api_keys(
@@ -161,15 +250,17 @@ class FirestoreKeyStore:
         if not cleaned:
             return {"added": 0, "skipped": 0, "total": len(self.list_elevenlabs_api_keys())}
 
-        existing_snap = self._doc_ref.get()
+        # Key ids are pure functions of the input; compute them before the Firestore read.
+        pairs = [(api_key, _sha256_kid(api_key)) for api_key in cleaned]
+
+        existing_snap = self._doc_ref.get(field_paths=["elevenlabs_keys"])
         existing_data = existing_snap.to_dict() if existing_snap.exists else {}
         existing_keys = existing_data.get("elevenlabs_keys") if isinstance(existing_data, dict) else None
         existing_key_ids: set[str] = set(existing_keys.keys()) if isinstance(existing_keys, dict) else set()
 
         update: dict[str, Any] = {}
         skipped = 0
-        for api_key in cleaned:
-            kid = _sha256_hex(api_key)[:24]
+        for api_key, kid in pairs:
             if kid in existing_key_ids:
                 skipped += 1
                 continue
@@ -182,16 +273,20 @@ class FirestoreKeyStore:
             }
 
         if update:
-            self._doc_ref.set({}, merge=True)
-            self._doc_ref.update(update)
+            self._merge_in_chunks(update)
+            self._invalidate("elevenlabs_keys")
 
-        total = len(self.list_elevenlabs_api_keys())
+        # Derive the total from the snapshot we already read instead of fetching the doc again.
+        total = len(existing_key_ids) + len(update)
         return {"added": len(update), "skipped": skipped, "total": total}
 
     def get_ollama_model(self) -> Optional[str]:
         """Return the runtime Ollama model override, if configured."""
 
-        snap = self._doc_ref.get()
+        return self._cached("ollama_model", self._load_ollama_model)
+
+    def _load_ollama_model(self) -> Optional[str]:
+        snap = self._doc_ref.get(field_paths=["runtime.ollama_model"])
         if not snap.exists:
             return None
 
@@ -217,9 +312,8 @@ class FirestoreKeyStore:
             "runtime.ollama_model_source": source,
         }
 
-        # Ensure doc exists; set merge also works.
-        self._doc_ref.set({}, merge=True)
-        self._doc_ref.update(update)
+        self._doc_ref.set(_dot_to_nested(update), merge=True)
+        self._invalidate("ollama_model")
 
     def clear_ollama_model(self, *, cleared_by_id: int, cleared_by_name: str, source: str) -> None:
         """Remove the runtime Ollama model override.
@@ -237,5 +331,5 @@ class FirestoreKeyStore:
             "runtime.ollama_model_cleared_source": source,
         }
 
-        self._doc_ref.set({}, merge=True)
-        self._doc_ref.update(update)
+        self._doc_ref.set(_dot_to_nested(update), merge=True)
+        self._invalidate("ollama_model")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Iterator
 
 
 @dataclass
@@ -22,10 +22,9 @@ class KeyRing:
     def is_empty(self) -> bool:
         return not self.keys
 
-    def iter_keys(self) -> Iterable[str]:
+    def iter_keys(self) -> Iterator[str]:
         # Always try in fixed order; caller can keep metrics.
-        for key in self.keys:
-            yield key
+        return iter(self.keys)
 
     def set_keys(self, keys: list[str]) -> None:
         self.keys = keys
@@ -6,6 +6,13 @@ from typing import Any, Iterable
 
 import httpx
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class OllamaAuthError(RuntimeError):
     pass
@@ -27,26 +34,54 @@ class OllamaResponse:
 
 def _extract_content(data: dict[str, Any]) -> str:
     # Matches the common Ollama schema: { message: { content: "..." } }
+    # Decoded JSON only ever yields plain dict/list/str, so exact type checks suffice.
     msg = data.get("message")
-    if isinstance(msg, dict) and isinstance(msg.get("content"), str):
-        return msg["content"]
+    if type(msg) is dict:
+        content = msg.get("content")
+        if type(content) is str:
+            return content
 
     # Fallbacks (just in case the hosted API differs)
-    if isinstance(data.get("content"), str):
-        return data["content"]
+    content = data.get("content")
+    if type(content) is str:
+        return content
 
     # Some APIs return {choices:[{message:{content}}]}
     choices = data.get("choices")
-    if isinstance(choices, list) and choices:
+    if type(choices) is list and choices:
         first = choices[0]
-        if isinstance(first, dict):
+        if type(first) is dict:
             m = first.get("message")
-            if isinstance(m, dict) and isinstance(m.get("content"), str):
-                return m["content"]
+            if type(m) is dict:
+                content = m.get("content")
+                if type(content) is str:
+                    return content
 
     raise RuntimeError("Unexpected Ollama response schema")
 
 
+_ollama_client: httpx.AsyncClient | None = None
+
+
+def _get_ollama_client() -> httpx.AsyncClient:
+    """Return the process-wide Ollama client (keeps TLS connections warm between calls)."""
+
+    global _ollama_client
+    if _ollama_client is None or _ollama_client.is_closed:
+        _ollama_client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+    return _ollama_client
+
+
+async def close_ollama_client() -> None:
+    global _ollama_client
+    client, _ollama_client = _ollama_client, None
+    if client is not None:
+        await client.aclose()
+
+
 async def chat_with_key_rotation(
     *,
     api_url: str,
@@ -57,33 +92,34 @@ async def chat_with_key_rotation(
 ) -> OllamaResponse:
     last_error: Exception | None = None
 
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
-        for api_key in api_keys:
-            try:
-                resp = await client.post(
-                    api_url,
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json={
-                        "model": model,
-                        "messages": messages,
-                        "stream": False,
-                    },
-                )
-
-                if resp.status_code in (401, 403):
-                    raise OllamaAuthError(f"Auth failed ({resp.status_code})")
-                if resp.status_code == 429:
-                    raise OllamaRateLimitError("Rate limited (429)")
-                if resp.status_code >= 500:
-                    raise OllamaServerError(f"Server error ({resp.status_code})")
-
-                resp.raise_for_status()
-                data = resp.json()
-                content = _extract_content(data)
-                return OllamaResponse(content=content, raw=data)
-
-            except (OllamaAuthError, OllamaRateLimitError, OllamaServerError, httpx.HTTPError, json.JSONDecodeError) as exc:
-                last_error = exc
-                continue
+    client = _get_ollama_client()
+    for api_key in api_keys:
+        try:
+            resp = await client.post(
+                api_url,
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={
+                    "model": model,
+                    "messages": messages,
+                    "stream": False,
+                },
+                timeout=timeout_s,
+            )
+
+            if resp.status_code in (401, 403):
+                raise OllamaAuthError(f"Auth failed ({resp.status_code})")
+            if resp.status_code == 429:
+                raise OllamaRateLimitError("Rate limited (429)")
+            if resp.status_code >= 500:
+                raise OllamaServerError(f"Server error ({resp.status_code})")
+
+            resp.raise_for_status()
+            data = resp.json()
+            content = _extract_content(data)
+            return OllamaResponse(content=content, raw=data)
+
+        except (OllamaAuthError, OllamaRateLimitError, OllamaServerError, httpx.HTTPError, json.JSONDecodeError) as exc:
+            last_error = exc
+            continue
 
     raise RuntimeError(f"All API keys failed; last error: {last_error!r}")
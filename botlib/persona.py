@@ -1,8 +1,31 @@
 from __future__ import annotations
 
-import json
+import functools
 import re
 from pathlib import Path
+from typing import Any
+
+from . import fast_json
+
+
+@functools.lru_cache(maxsize=32)
+def _persona_pattern(name: str) -> re.Pattern[str]:
+    return re.compile(
+        rf"^###\s+\*\*{re.escape(name)}\*\*\s*$\n(.*?)(?=^###\s+\*\*|\Z)",
+        re.MULTILINE | re.DOTALL,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _read_text_cached(path: str, mtime_ns: int) -> str:
+    # mtime_ns is part of the cache key only, so edits to the file are picked up.
+    return Path(path).read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> Any:
+    # Callers only read from the parsed data, so the cached object is shared.
+    return fast_json.loads(Path(path).read_bytes())
 
 
 def load_character_persona(characters_md_path: Path, *, character_name: str) -> str:
@@ -15,11 +38,17 @@ def load_character_persona(characters_md_path: Path, *, character_name: str) ->
 
     # 1) Prefer JSON if present.
     json_path = characters_md_path.with_suffix(".json")
-    if json_path.exists():
-        data = json.loads(json_path.read_text(encoding="utf-8"))
+    try:
+        json_mtime_ns: int | None = json_path.stat().st_mtime_ns  # one stat doubles as the exists() check
+    except FileNotFoundError:
+        json_mtime_ns = None
+    if json_mtime_ns is not None:
+        data = _load_json_cached(str(json_path), json_mtime_ns)
         aliases = data.get("aliases") if isinstance(data, dict) else {}
         if isinstance(aliases, dict):
-            normalized = aliases.get(normalized, aliases.get(normalized.lower(), normalized))
+            # Exact-name alias first; only lowercase and retry when that misses.
+            alias = aliases.get(normalized)
+            normalized = alias if alias is not None else aliases.get(normalized.lower(), normalized)
 
         characters = data.get("characters") if isinstance(data, dict) else None
         if isinstance(characters, dict):
@@ -30,23 +59,27 @@ def load_character_persona(characters_md_path: Path, *, character_name: str) ->
         raise RuntimeError(f"Character {normalized!r} not found in characters.json")
 
     # 2) Fallback: parse markdown.
-    text = characters_md_path.read_text(encoding="utf-8")
+    text = _read_text_cached(str(characters_md_path), characters_md_path.stat().st_mtime_ns)
 
     # Normalize common misspelling: Linae -> Lynae
     if normalized.lower() == "linae":
         normalized = "Lynae"
 
-    pattern = re.compile(
-        rf"^###\s+\*\*{re.escape(normalized)}\*\*\s*$\n(.*?)(?=^###\s+\*\*|\Z)",
-        re.MULTILINE | re.DOTALL,
-    )
-    m = pattern.search(text)
+    m = _persona_pattern(normalized).search(text)
     if not m:
         raise RuntimeError(f"Character {normalized!r} not found in characters.md")
 
     return m.group(1).strip()
 
 
+_SYS_PREFIX = (
+    "You are a Discord chat character roleplaying exactly as described below. "
+    "Stay in-character, be helpful, and sound like a real person chatting (natural, not robotic). "
+    "Keep replies concise unless asked for detail.\n\n"
+    "CHARACTER PROFILE:\n"
+)
+
+
 def make_system_prompt(*, character_block: str, overall_behaviour_lines: list[str] | None = None) -> str:
     # Keep it short and directive; the markdown block already contains style.
     overall_block = ""
@@ -58,10 +91,4 @@ def make_system_prompt(*, character_block: str, overall_behaviour_lines: list[st
                 f"{rules}\n\n"
             )
 
-    return overall_block + (
-        "You are a Discord chat character roleplaying exactly as described below. "
-        "Stay in-character, be helpful, and sound like a real person chatting (natural, not robotic). "
-        "Keep replies concise unless asked for detail.\n\n"
-        "CHARACTER PROFILE:\n"
-        f"{character_block}\n"
-    )
+    return overall_block + _SYS_PREFIX + character_block + "\n"
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 from firebase_admin import firestore
 
-from .firestore_keys import _init_firebase
+from .firestore_keys import _firestore_client
 
 
 _EMOJI_RE = re.compile(
@@ -27,6 +28,26 @@ _EMOJI_RE = re.compile(
     flags=re.UNICODE,
 )
 
+_ASCII_NON_LETTERS = bytes(b for b in range(128) if not chr(b).isalpha())
+
+_MAX_BATCH_WRITES = 500  # Firestore limit per WriteBatch
+
+# The only fields get_summary reads (field-mask read instead of the whole profile doc).
+_SUMMARY_FIELDS = [
+    "stats.message_count",
+    "stats.total_chars",
+    "stats.question_count",
+    "stats.emoji_message_count",
+    "stats.non_english_heavy_count",
+    "stats.last_keywords",
+]
+
+_KEYWORD_RE = re.compile(r"[a-z0-9_]{4,}")
+_EDGE_PUNCT = ".,!?;:()[]\"'"
+_QUESTION_RE = re.compile(r"^(why|how|what|when|where|who|which)\b")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_UNDERSCORE_RUN_RE = re.compile(r"_+")
+
 _STOPWORDS = {
     "about",
     "after",
@@ -88,17 +109,28 @@ _STOPWORDS = {
 
 
 def _extract_keywords(text: str) -> list[str]:
-    t = (text or "").lower()
-    words = re.findall(r"[a-z0-9_]{4,}", t)
-    cleaned = [w for w in words if w not in _STOPWORDS]
-    # De-dup preserve order
+    # Single pass: skip stopwords/dupes and stop scanning once 12 keywords are found.
+    # Plain ASCII alphanumeric tokens (the common case) are whole matches on their own; only
+    # tokens with inner punctuation, underscores or non-ASCII chars go through the regex.
+    # Keyword runs never span whitespace or edge punctuation, so the output is the same.
     seen: set[str] = set()
     out: list[str] = []
-    for w in cleaned:
-        if w not in seen:
+    for tok in (text or "").lower().split():
+        tok = tok.strip(_EDGE_PUNCT)
+        if len(tok) < 4:
+            continue
+        if tok.isascii() and tok.isalnum():
+            words: Iterable[str] = (tok,)
+        else:
+            words = _KEYWORD_RE.findall(tok)
+        for w in words:
+            if w in _STOPWORDS or w in seen:
+                continue
             seen.add(w)
             out.append(w)
-    return out[:12]
+            if len(out) >= 12:
+                return out
+    return out
 
 
 def _looks_like_question(text: str) -> bool:
@@ -107,17 +139,21 @@ def _looks_like_question(text: str) -> bool:
         return False
     if "?" in t:
         return True
-    return bool(re.match(r"^(why|how|what|when|where|who|which)\b", t.lower()))
+    return bool(_QUESTION_RE.match(t.lower()))
 
 
 def _is_non_english_heavy(text: str) -> bool:
     # Very rough heuristic: if a large fraction of letters are non-ascii.
     t = text or ""
-    letters = [ch for ch in t if ch.isalpha()]
-    if len(letters) < 8:
+    if t.isascii():
+        return False
+    letters = sum(map(str.isalpha, t))
+    if letters < 8:
         return False
-    non_ascii = sum(1 for ch in letters if ord(ch) > 127)
-    return (non_ascii / max(1, len(letters))) >= 0.30
+    # ASCII letters: drop non-ASCII chars, then delete ASCII non-letters (both in C).
+    ascii_letters = len(t.encode("ascii", "ignore").translate(None, _ASCII_NON_LETTERS))
+    non_ascii = letters - ascii_letters
+    return (non_ascii / letters) >= 0.30
 
 
 @dataclass(frozen=True)
@@ -137,21 +173,22 @@ class FirestoreUserProfileStore:
         bot_key: str,
         prefix: str = "user_profile_",
     ) -> None:
-        _init_firebase(credentials_path=credentials_path)
-        self._db = firestore.client()
+        self._db = _firestore_client(credentials_path=credentials_path)
         self._collection = collection
         self._prefix = prefix
         self._bot_key = self._sanitize_key(bot_key)
+        # Active users message repeatedly; reuse their DocumentReferences.
+        self._doc_ref = functools.lru_cache(maxsize=256)(self._make_doc_ref)
 
     @staticmethod
     def _sanitize_key(value: str) -> str:
         v = (value or "").strip().lower()
         # keep a-z0-9 and underscores only
-        v = re.sub(r"[^a-z0-9]+", "_", v)
-        v = re.sub(r"_+", "_", v).strip("_")
+        v = _NON_ALNUM_RE.sub("_", v)
+        v = _UNDERSCORE_RUN_RE.sub("_", v).strip("_")
         return v or "default"
 
-    def _doc_ref(self, user_id: int):
+    def _make_doc_ref(self, user_id: int):
         # Per-bot profile document.
         return self._db.collection(self._collection).document(f"{self._prefix}{self._bot_key}_{user_id}")
 
@@ -159,38 +196,68 @@ class FirestoreUserProfileStore:
         # Back-compat: old global (non-bot-specific) profile document.
         return self._db.collection(self._collection).document(f"{self._prefix}{user_id}")
 
-    def record_user_message(self, *, user_id: int, user_name: str, content: str, source: str = "discord") -> None:
+    def _build_update(self, *, user_id: int, user_name: str, content: str, source: str) -> Optional[dict[str, Any]]:
         content = (content or "").strip()
         if not content:
-            return
+            return None
 
-        emoji_count = len(_EMOJI_RE.findall(content))
+        # Only presence is recorded, so stop at the first emoji instead of collecting them all.
+        has_emoji = _EMOJI_RE.search(content) is not None
         is_question = _looks_like_question(content)
         non_english_heavy = _is_non_english_heavy(content)
         keywords = _extract_keywords(content)
 
+        # Nested so a single set(merge=True) both creates the doc and applies the increments.
         # Keep only a small rolling set of recent keywords.
-        update: dict[str, Any] = {
+        return {
             "user_id": user_id,
             "user_name": user_name,
             "source": source,
-            "stats.message_count": firestore.Increment(1),
-            "stats.total_chars": firestore.Increment(len(content)),
-            "stats.question_count": firestore.Increment(1 if is_question else 0),
-            "stats.emoji_message_count": firestore.Increment(1 if emoji_count > 0 else 0),
-            "stats.non_english_heavy_count": firestore.Increment(1 if non_english_heavy else 0),
-            "stats.last_seen_at": firestore.SERVER_TIMESTAMP,
-            "stats.last_keywords": keywords,
+            "stats": {
+                "message_count": firestore.Increment(1),
+                "total_chars": firestore.Increment(len(content)),
+                "question_count": firestore.Increment(1 if is_question else 0),
+                "emoji_message_count": firestore.Increment(1 if has_emoji else 0),
+                "non_english_heavy_count": firestore.Increment(1 if non_english_heavy else 0),
+                "last_seen_at": firestore.SERVER_TIMESTAMP,
+                "last_keywords": keywords,
+            },
         }
 
-        self._doc_ref(user_id).set({}, merge=True)
-        self._doc_ref(user_id).update(update)
+    def record_user_message(self, *, user_id: int, user_name: str, content: str, source: str = "discord") -> None:
+        update = self._build_update(user_id=user_id, user_name=user_name, content=content, source=source)
+        if update is None:
+            return
+        self._doc_ref(user_id).set(update, merge=True)
+
+    def record_user_messages(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Record several messages (record_user_message kwargs) using batched commits."""
+
+        batch = self._db.batch()
+        pending = 0
+        for entry in entries:
+            update = self._build_update(
+                user_id=entry["user_id"],
+                user_name=entry["user_name"],
+                content=entry["content"],
+                source=entry.get("source", "discord"),
+            )
+            if update is None:
+                continue
+            batch.set(self._doc_ref(entry["user_id"]), update, merge=True)
+            pending += 1
+            if pending >= _MAX_BATCH_WRITES:
+                batch.commit()
+                batch = self._db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
 
     def get_summary(self, *, user_id: int) -> Optional[UserProfileSummary]:
-        snap = self._doc_ref(user_id).get()
+        snap = self._doc_ref(user_id).get(field_paths=_SUMMARY_FIELDS)
         if not snap.exists:
             # Fallback to legacy global profile if bot-specific doesn't exist yet.
-            legacy = self._legacy_doc_ref(user_id).get()
+            legacy = self._legacy_doc_ref(user_id).get(field_paths=_SUMMARY_FIELDS)
             if not legacy.exists:
                 return None
             snap = legacy
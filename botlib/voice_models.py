@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from typing import Optional
@@ -15,6 +16,24 @@ class ElevenLabsVoiceProfile:
     voice_settings: ElevenLabsVoiceSettings = ElevenLabsVoiceSettings()
 
 
+# Personality-aligned default voice settings, keyed by lowercased character name.
+# (These are safe-ish defaults; tweak per your taste.)
+_SHOREKEEPER_SETTINGS = ElevenLabsVoiceSettings(stability=0.75, similarity_boost=0.7, style=0.15, use_speaker_boost=True)
+_CANTARELLA_SETTINGS = ElevenLabsVoiceSettings(stability=0.55, similarity_boost=0.8, style=0.35, use_speaker_boost=True)
+_CHISA_SETTINGS = ElevenLabsVoiceSettings(stability=0.8, similarity_boost=0.65, style=0.05, use_speaker_boost=True)
+_LYNAE_SETTINGS = ElevenLabsVoiceSettings(stability=0.45, similarity_boost=0.75, style=0.35, use_speaker_boost=True)
+
+_CHAR_SETTINGS: dict[str, ElevenLabsVoiceSettings] = {
+    "shorekeeper": _SHOREKEEPER_SETTINGS,
+    "cantarella": _CANTARELLA_SETTINGS,
+    "chisa": _CHISA_SETTINGS,
+    "lynae": _LYNAE_SETTINGS,
+    "linae": _LYNAE_SETTINGS,
+}
+_DEFAULT_SETTINGS = ElevenLabsVoiceSettings()
+
+
+@functools.lru_cache(maxsize=64)
 def _env_key_for_character(character_name: str) -> str:
     # ELEVENLABS_VOICE_ID_LYNAE, ELEVENLABS_VOICE_ID_SHOREKEEPER, ...
     clean = "".join(c for c in (character_name or "") if c.isalnum() or c in {"_", "-"}).strip()
@@ -45,20 +64,8 @@ def load_elevenlabs_voice_profile_for_character(*, character_name: str) -> Optio
     model_id = (os.getenv("ELEVENLABS_MODEL_ID", "") or "").strip() or "eleven_multilingual_v2"
     output_format = (os.getenv("ELEVENLABS_OUTPUT_FORMAT", "") or "").strip() or "mp3_44100_128"
 
-    # Personality-aligned default voice settings.
-    # (These are safe-ish defaults; tweak per your taste.)
     cname = (character_name or "").strip().lower()
-
-    if cname in {"shorekeeper"}:
-        settings = ElevenLabsVoiceSettings(stability=0.75, similarity_boost=0.7, style=0.15, use_speaker_boost=True)
-    elif cname in {"cantarella"}:
-        settings = ElevenLabsVoiceSettings(stability=0.55, similarity_boost=0.8, style=0.35, use_speaker_boost=True)
-    elif cname in {"chisa"}:
-        settings = ElevenLabsVoiceSettings(stability=0.8, similarity_boost=0.65, style=0.05, use_speaker_boost=True)
-    elif cname in {"lynae", "linae"}:
-        settings = ElevenLabsVoiceSettings(stability=0.45, similarity_boost=0.75, style=0.35, use_speaker_boost=True)
-    else:
-        settings = ElevenLabsVoiceSettings()
+    settings = _CHAR_SETTINGS.get(cname, _DEFAULT_SETTINGS)
 
     return ElevenLabsVoiceProfile(
         voice_id=voice_id,
@@ -1,12 +1,48 @@
 from __future__ import annotations
 
-import json
 import random
 import re
-import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
+from . import fast_json
+
+
+_URL_RE = re.compile(r"https?://\S+", re.IGNORECASE)
+
+# Substring triggers, matched with one alternation scan per message.
+_WANT_VOICE_RE = re.compile(
+    "|".join(
+        re.escape(k)
+        for k in (
+            "voice",
+            "say it",
+            "say this",
+            "read this",
+            "read it",
+            "speak",
+            "talk",
+            "send a voice",
+            "send voice",
+            "voice message",
+        )
+    )
+)
+_WANT_TEXT_RE = re.compile(
+    "|".join(
+        re.escape(k)
+        for k in (
+            "text",
+            "type it",
+            "write it",
+            "no voice",
+            "don't use voice",
+            "dont use voice",
+            "no audio",
+        )
+    )
+)
+
 
 @dataclass(frozen=True)
 class VoiceDecision:
@@ -21,9 +57,9 @@ def _extract_json_object(text: str) -> Optional[dict[str, Any]]:
         return None
     blob = text[start : end + 1]
     try:
-        obj = json.loads(blob)
+        obj = fast_json.loads(blob)
         return obj if isinstance(obj, dict) else None
-    except json.JSONDecodeError:
+    except ValueError:
         return None
 
 
@@ -31,26 +67,13 @@ def _contains_code_or_links(text: str) -> bool:
     t = text or ""
     if "```" in t:
         return True
-    if re.search(r"https?://\S+", t, re.IGNORECASE):
+    if _URL_RE.search(t):
         return True
     return False
 
 
 def _user_explicitly_wants_voice(text: str) -> bool:
-    t = (text or "").lower()
-    triggers = (
-        "voice",
-        "say it",
-        "say this",
-        "read this",
-        "read it",
-        "speak",
-        "talk",
-        "send a voice",
-        "send voice",
-        "voice message",
-    )
-    return any(k in t for k in triggers)
+    return _WANT_VOICE_RE.search((text or "").lower()) is not None
 
 
 def user_explicitly_wants_voice(text: str) -> bool:
@@ -60,17 +83,7 @@ def user_explicitly_wants_voice(text: str) -> bool:
 
 
 def _user_explicitly_wants_text(text: str) -> bool:
-    t = (text or "").lower()
-    triggers = (
-        "text",
-        "type it",
-        "write it",
-        "no voice",
-        "don't use voice",
-        "dont use voice",
-        "no audio",
-    )
-    return any(k in t for k in triggers)
+    return _WANT_TEXT_RE.search((text or "").lower()) is not None
 
 
 def should_allow_voice(
@@ -127,13 +140,16 @@ async def decide_voice_vs_text(
     if cooldown_remaining_s > 0:
         return VoiceDecision(send_mode="text", reason="cooldown")
 
-    seed = deterministic_seed
-    if seed is None:
-        seed = int(time.time() * 1000) & 0xFFFFFFFF
-    rng = random.Random(seed)
-
     # We include a random number so the model can choose voice "for fun" sometimes.
-    roll = rng.random()
+    # Only build a private generator when a reproducible roll is requested.
+    if deterministic_seed is None:
+        roll = random.random()
+    else:
+        roll = random.Random(deterministic_seed).random()
+
+    # The roll alone forces text here: voice is only considered below fun_probability, so skip the model call.
+    if roll >= fun_probability:
+        return VoiceDecision(send_mode="text", reason="fun_probability_gate")
 
     router_system = (
         "You are a message delivery router for a Discord character bot. "
@@ -174,8 +190,4 @@ async def decide_voice_vs_text(
     if not isinstance(reason, str) or not reason.strip():
         reason = "model_default"
 
-    # Enforce rarity unless user asked for voice.
-    if mode == "voice" and not user_wants_voice and roll >= fun_probability:
-        return VoiceDecision(send_mode="text", reason="fun_probability_gate")
-
     return VoiceDecision(send_mode=mode, reason=reason.strip())
@@ -1,12 +1,56 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 
 
+# How long stopped bots get to exit after terminate() before they are killed.
+_STOP_TIMEOUT_S = 10.0
+
+
+async def _supervise(commands: list[list[str]], *, cwd: str, env: dict[str, str]) -> int:
+    """Start every bot and wait until one exits; return its exit code."""
+
+    procs: list[asyncio.subprocess.Process] = []
+    waiters: list[asyncio.Task] = []
+    try:
+        for argv in commands:
+            procs.append(await asyncio.create_subprocess_exec(*argv, cwd=cwd, env=env))
+
+        # Wait for any bot to exit; keep manager alive (no polling).
+        waiters = [asyncio.create_task(p.wait()) for p in procs]
+        done, _pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        rc = next(iter(done)).result()
+        print(f"A bot exited with code {rc}. Stopping others...")
+        return rc
+    finally:
+        # Also runs on Ctrl+C (task cancellation), so no child is left behind.
+        for w in waiters:
+            w.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+        running = [p for p in procs if p.returncode is None]
+        for p in running:
+            try:
+                p.terminate()
+            except ProcessLookupError:
+                pass
+        # Reap the children before the loop closes; kill any that ignore terminate().
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in running)), timeout=_STOP_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            for p in running:
+                if p.returncode is None:
+                    try:
+                        p.kill()
+                    except ProcessLookupError:
+                        pass
+            await asyncio.gather(*(p.wait() for p in running))
+
+
 def main() -> int:
     root = Path(__file__).resolve().parent
     cfg_path = root / "bots.json"
@@ -20,7 +64,7 @@ def main() -> int:
         print("bots.json has no bots")
         return 2
 
-    procs: list[subprocess.Popen] = []
+    commands: list[list[str]] = []
 
     python_exe = sys.executable
     env = os.environ.copy()
@@ -34,67 +78,47 @@ def main() -> int:
 
         if bot_type == "admin":
             print(f"Starting admin bot: {name}")
-            procs.append(
-                subprocess.Popen(
-                    [
-                        python_exe,
-                        str(root / "run_bot.py"),
-                        "--type",
-                        "admin",
-                        "--bot-name",
-                        str(name),
-                        "--token-env",
-                        str(token_env),
-                    ],
-                    cwd=str(root),
-                    env=env,
-                )
-            )
-            continue
-
-        character = bot.get("character")
-        if not character:
-            continue
-
-        print(f"Starting bot: {name} ({character})")
-        procs.append(
-            subprocess.Popen(
+            commands.append(
                 [
                     python_exe,
                     str(root / "run_bot.py"),
                     "--type",
-                    "character",
+                    "admin",
                     "--bot-name",
                     str(name),
-                    "--character-name",
-                    str(character),
                     "--token-env",
                     str(token_env),
-                ],
-                cwd=str(root),
-                env=env,
+                ]
             )
+            continue
+
+        character = bot.get("character")
+        if not character:
+            continue
+
+        print(f"Starting bot: {name} ({character})")
+        commands.append(
+            [
+                python_exe,
+                str(root / "run_bot.py"),
+                "--type",
+                "character",
+                "--bot-name",
+                str(name),
+                "--character-name",
+                str(character),
+                "--token-env",
+                str(token_env),
+            ]
         )
 
-    if not procs:
+    if not commands:
         print("No valid bots in bots.json")
         return 2
 
     try:
-        # Wait for any bot to exit; keep manager alive.
-        while True:
-            for p in procs:
-                rc = p.poll()
-                if rc is not None:
-                    print(f"A bot exited with code {rc}. Stopping others...")
-                    for other in procs:
-                        if other.poll() is None:
-                            other.terminate()
-                    return rc
+        return asyncio.run(_supervise(commands, cwd=str(root), env=env))
     except KeyboardInterrupt:
-        for p in procs:
-            if p.poll() is None:
-                p.terminate()
         return 130
 
 
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
+import functools
+import inspect
+import itertools
 import os
+import re
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import AsyncIterator, Callable, Generator, Iterable
 
 from dotenv import load_dotenv
+from firebase_admin import credentials
+from google.api_core import exceptions as gexc
+from google.cloud.firestore import AsyncClient
 
 
 # Ensure repo root is on sys.path so `botlib` is importable when running as a script.
@@ -15,57 +26,521 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
-from botlib.firestore_keys import _init_firebase
+from botlib import fast_json
+from botlib.firestore_keys import _firestore_client
 
 
-def _iter_documents(collection_ref, *, page_size: int) -> Iterable[object]:
-    """Yield documents from a collection in pages.
+# Special field path for the document id/name (usable in select/order_by/where).
+_DOC_ID_FIELD = "__name__"
 
-    We intentionally do not try to be clever with cursors: after each page is deleted,
-    we re-query the first N docs until the collection is empty.
+# Firestore allows at most 500 writes per batch commit.
+_MAX_BATCH_DELETES = 500
+
+# Matched docs whose trees may be queued for walking at once (backpressure on the scan).
+_MAX_QUEUED_MATCHES = 4096
+
+# Server-side "slow down"/transient errors on reads and commits: retry with exponential backoff.
+_RETRYABLE_RPC_ERRORS = (
+    gexc.Aborted,
+    gexc.DeadlineExceeded,
+    gexc.InternalServerError,
+    gexc.ServiceUnavailable,
+)
+_RPC_ATTEMPTS = 5
+
+# Adaptive page/batch size bounds (--adaptive): grow by _PAGE_SIZE_STEP per good page or
+# batch, halve on a throttling error.
+_MIN_PAGE_SIZE = 25
+_PAGE_SIZE_STEP = 50
+
+
+class _AimdLimit:
+    """Thread-safe additive-increase/multiplicative-decrease limit.
+
+    `increase()` adds `step` after a success and `decrease()` halves the value after a
+    throttling error, always staying within [floor, ceiling]. With floor == ceiling the
+    limit is fixed, which is how `--no-adaptive` runs.
     """
 
-    while True:
-        docs = list(collection_ref.limit(page_size).stream())
-        if not docs:
+    def __init__(self, initial: int, *, floor: int, ceiling: int, step: int = 1) -> None:
+        self._floor = max(1, int(floor))
+        self._ceiling = max(self._floor, int(ceiling))
+        self._step = max(1, int(step))
+        self._value = min(max(int(initial), self._floor), self._ceiling)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fixed(cls, value: int) -> "_AimdLimit":
+        return cls(value, floor=value, ceiling=value)
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def increase(self) -> None:
+        with self._lock:
+            self._value = min(self._ceiling, self._value + self._step)
+
+    def decrease(self) -> None:
+        with self._lock:
+            self._value = max(self._floor, self._value // 2)
+
+
+# The helpers below hold the paging, retry, batching and tree-walk logic shared by the
+# threaded path and --async. None of them does I/O: each path only runs the RPCs and
+# sleeps they ask for.
+
+
+class _Backoff:
+    """Exponential backoff for one read or commit loop, giving up after `_RPC_ATTEMPTS` tries."""
+
+    def __init__(self) -> None:
+        self._attempt = 0
+
+    def reset(self) -> None:
+        self._attempt = 0
+
+    def delay_after(self, exc: BaseException) -> float:
+        """Return how long to wait before retrying, or re-raise `exc` once the tries are spent."""
+
+        self._attempt += 1
+        if self._attempt >= _RPC_ATTEMPTS:
+            raise exc
+        return 0.5 * (2 ** (self._attempt - 1))
+
+
+class _PageCursor:
+    """Position of a walk over a collection by document name.
+
+    Each query resumes after the last document of the previous page, so already-seen
+    ids are never re-read and callers don't have to commit their deletes between pages.
+    Only document names are fetched (the tool never looks at field data), so scanning
+    a doc costs its id bytes rather than its whole payload.
+
+    With `tuner`, each page is `tuner.value` docs long: a full page grows it and a
+    throttled read halves it before the same page is retried.
+
+    With `stream`, callers run one unbounded `query()` and cut it into pages client-side,
+    which saves a round-trip per page. If the stream breaks with a transient error, it is
+    reopened after the last doc already handed out.
+    """
+
+    def __init__(
+        self,
+        collection_ref,
+        *,
+        page_size: int,
+        tuner: _AimdLimit | None = None,
+        stream: bool = False,
+    ) -> None:
+        self._base = collection_ref.select([_DOC_ID_FIELD]).order_by(_DOC_ID_FIELD)
+        self._page_size = max(1, int(page_size))
+        self._tuner = tuner
+        self._stream = stream
+        self._last = None
+        self._backoff = _Backoff()
+        self.finished = False
+
+    @property
+    def size(self) -> int:
+        return self._tuner.value if self._tuner is not None else self._page_size
+
+    def query(self, size: int | None = None):
+        """Query for the next `size` docs, or for every doc after the cursor."""
+
+        query = self._base.limit(size) if size is not None else self._base
+        return query.start_after(self._last) if self._last is not None else query
+
+    def advance(self, docs: list[object], size: int) -> None:
+        """Record a page read after asking for `size` docs; a short page ends the walk."""
+
+        self._backoff.reset()
+        if len(docs) < size:
+            self.finished = True
             return
-        for doc in docs:
-            yield doc
+        self._last = docs[-1]
+        if self._tuner is not None and not self._stream:
+            self._tuner.increase()
+
+    def retry_delay(self, exc: BaseException) -> float:
+        if self._tuner is not None and not self._stream:
+            self._tuner.decrease()
+        return self._backoff.delay_after(exc)
 
 
-def _delete_document_recursive(doc_ref) -> int:
-    """Recursively delete a document and all subcollections.
+class _CommitJob:
+    """Chunks of one queued batch, committed in order.
 
-    Returns number of documents deleted (including nested docs and the doc itself).
+    The chunk size is re-read every round, so a throttled batch is resent in smaller
+    pieces. Both AIMD limits grow after each committed chunk and halve on a retryable
+    error.
     """
 
-    deleted = 0
+    def __init__(self, refs: list[object], *, page_size: _AimdLimit, concurrency: _AimdLimit) -> None:
+        self._refs = refs
+        self._page_size = page_size
+        self._concurrency = concurrency
+        self._backoff = _Backoff()
+
+    @property
+    def done(self) -> bool:
+        return not self._refs
+
+    def next_chunk(self) -> list[object]:
+        return self._refs[: min(_MAX_BATCH_DELETES, self._page_size.value)]
+
+    def committed(self, chunk: list[object]) -> None:
+        self._refs = self._refs[len(chunk) :]
+        self._backoff.reset()
+        self._page_size.increase()
+        self._concurrency.increase()
+
+    def retry_delay(self, exc: BaseException) -> float:
+        # Deletes are idempotent; slow down, back off and resend.
+        self._page_size.decrease()
+        self._concurrency.decrease()
+        return self._backoff.delay_after(exc)
+
+
+def _delete_batch(db, refs: list[object]):
+    batch = db.batch()
+    for doc_ref in refs:
+        batch.delete(doc_ref)
+    return batch
+
+
+def _failed(ticket: Future) -> bool:
+    return ticket.cancelled() or ticket.exception() is not None
+
+
+def _copy_outcome(src: Future, dst: Future) -> None:
+    if src.cancelled():
+        dst.cancel()
+    elif src.exception() is not None:
+        dst.set_exception(src.exception())
+    else:
+        dst.set_result(None)
+
+
+class _BatchQueue:
+    """Deletes waiting for the next batch, which holds up to `page_size.value` refs.
+
+    Every batch has a ticket (a `Future`) that its commit resolves once all its chunks
+    are in. `add()` takes the tickets of a doc's children: a parent only joins a batch
+    after every batch holding its descendants has committed, so a crash or a failed
+    commit never leaves subcollections behind a deleted parent. Until then it is parked
+    and gets a stand-in ticket that follows the batch it eventually joins. If a child's
+    batch failed, the parent is dropped and inherits the failed ticket.
+
+    Not thread-safe; callers hold their own lock (or run on one event loop). Ticket
+    callbacks only resolve stand-ins, so a commit finishing never re-enters the queue.
+    """
+
+    def __init__(self, page_size: _AimdLimit) -> None:
+        self._page_size = page_size
+        self._pending: list[object] = []
+        self._ticket: Future = Future()
+        self._parked: list[tuple[object, list[Future], Future]] = []
+
+    @property
+    def parked(self) -> bool:
+        return bool(self._parked)
+
+    def add(self, doc_ref, after: Iterable[Future] = ()) -> tuple[Future, bool]:
+        """Queue a delete to commit after the batches in `after`.
+
+        Returns the doc's ticket and whether the open batch is now full.
+        """
+
+        waits = list(after)
+        for ticket in waits:
+            if ticket.done() and _failed(ticket):
+                return ticket, False
+        # Refs in one batch are committed in the order they were added, chunk by chunk, so
+        # children still in the open batch only matter if the parent can't join it now.
+        if not all(ticket.done() or ticket is self._ticket for ticket in waits):
+            stand_in: Future = Future()
+            self._parked.append((doc_ref, waits, stand_in))
+            return stand_in, False
+        self._pending.append(doc_ref)
+        return self._ticket, len(self._pending) >= min(_MAX_BATCH_DELETES, self._page_size.value)
+
+    def take(self) -> tuple[list[object], Future] | None:
+        """Close the open batch (plus any parked parents now free to go) and return it with its ticket."""
+
+        self._release_parked()
+        if not self._pending:
+            return None
+        batch = (self._pending, self._ticket)
+        self._pending, self._ticket = [], Future()
+        return batch
+
+    def clear(self) -> None:
+        self._pending = []
+        self._parked = []
+
+    def _release_parked(self) -> None:
+        still_parked = []
+        for doc_ref, waits, stand_in in self._parked:
+            if not all(ticket.done() or ticket is self._ticket for ticket in waits):
+                still_parked.append((doc_ref, waits, stand_in))
+                continue
+            failed = next((ticket for ticket in waits if ticket.done() and _failed(ticket)), None)
+            if failed is not None:
+                _copy_outcome(failed, stand_in)
+                continue
+            self._pending.append(doc_ref)
+            self._ticket.add_done_callback(functools.partial(_copy_outcome, dst=stand_in))
+        self._parked = still_parked
+
+
+def _delete_tree_steps(
+    doc_ref,
+    *,
+    tuner: _AimdLimit,
+    known_subcollections: tuple[str, ...] | None = None,
+) -> Generator[tuple, object, int]:
+    """Plan the deletes for `doc_ref` and every document beneath it, children first.
+
+    Yields the I/O the caller has to run and send back:
 
-    # Delete subcollection documents first.
-    for subcoll in doc_ref.collections():
-        deleted += _delete_collection_recursive(subcoll)
+    - ("collections", ref): the subcollections of `ref`, as a list;
+    - ("page", cursor): the next page at a `_PageCursor`, as a list of snapshots;
+    - ("delete", ref, after): queue the delete behind the tickets in `after` (those of
+      the doc's children) and send back the doc's own ticket; see `_BatchQueue`.
 
-    doc_ref.delete()
-    return deleted + 1
+    Returns the number of documents deleted. Uses an explicit stack instead of
+    recursion, so a whole tree (and many trees in a row) feeds one stream of refs into
+    the caller's batches.
 
+    With `known_subcollections`, only those subcollections of `doc_ref` are visited and
+    their documents are treated as leaves. This skips the listCollectionIds RPC that
+    `collections()` costs for every document when the schema is already known.
+    """
 
-def _delete_collection_recursive(collection_ref, *, page_size: int = 200) -> int:
     deleted = 0
-    for doc in _iter_documents(collection_ref, page_size=page_size):
-        deleted += _delete_document_recursive(doc.reference)
+    # (ref, tickets of the parent's children, tickets of this doc's children once expanded)
+    stack: list[tuple[object, list[Future], list[Future] | None]] = [(doc_ref, [], None)]
+    while stack:
+        ref, siblings, children = stack.pop()
+        if children is not None:
+            siblings.append((yield ("delete", ref, children)))
+            deleted += 1
+            continue
+        children = []
+        stack.append((ref, siblings, children))
+        if known_subcollections is not None:
+            subcollections = [ref.collection(name) for name in known_subcollections]
+        else:
+            subcollections = yield ("collections", ref)
+        for subcoll in subcollections:
+            cursor = _PageCursor(subcoll, page_size=tuner.value, tuner=tuner)
+            while not cursor.finished:
+                docs = yield ("page", cursor)
+                if known_subcollections is None:
+                    stack.extend((doc.reference, children, None) for doc in docs)
+                    continue
+                for doc in docs:
+                    children.append((yield ("delete", doc.reference, ())))
+                    deleted += 1
     return deleted
 
 
+class _BatchDeleter:
+    """Accumulates document deletes and commits them in WriteBatches of up to 500.
+
+    Full batches are committed on a thread pool, with at most `concurrency.value` commits
+    outstanding, so commit round-trips overlap with scanning and with each other. Every
+    batch comes from the one `db` client (it is thread-safe), so the workers multiplex
+    over a single channel instead of opening their own.
+    Batches hold up to `page_size.value` deletes. Both limits grow while commits succeed
+    and halve when the server pushes back, and readers share `page_size` for their pages.
+    A doc added with its children's tickets is held back until their batches have
+    committed, however the batches interleave (see `_BatchQueue`).
+    `add`, `flush` and `drain` may be called from several threads.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        executor: ThreadPoolExecutor,
+        concurrency: _AimdLimit,
+        page_size: _AimdLimit,
+    ) -> None:
+        self._db = db
+        self._executor = executor
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self._slots = threading.Condition()
+        self._in_flight = 0
+        self._lock = threading.RLock()
+        self._queue = _BatchQueue(page_size)
+        self._futures: list[Future] = []
+
+    def add(self, doc_ref, *, after: Iterable[Future] = ()) -> Future:
+        """Queue a delete to commit after the batches in `after`; returns its ticket."""
+
+        with self._lock:
+            ticket, full = self._queue.add(doc_ref, after)
+            if full:
+                self.flush()
+            return ticket
+
+    def flush(self) -> None:
+        """Submit the pending deletes as one batch (blocks only while the pool is saturated)."""
+
+        with self._lock:
+            batch = self._queue.take()
+            if batch is None:
+                return
+            refs, ticket = batch
+            with self._slots:
+                while self._in_flight >= self.concurrency.value:
+                    self._slots.wait()
+                self._in_flight += 1
+            try:
+                self._futures.append(self._executor.submit(self._commit, refs, ticket))
+            except BaseException:
+                self._release_slot()
+                raise
+            # Surface failures early and keep the futures list short.
+            self._reap(wait=False)
+
+    def drain(self) -> None:
+        """Commit everything queued so far and wait for all outstanding batches."""
+
+        with self._lock:
+            self.flush()
+            # Each committed batch may free parked parents for another batch.
+            while self._futures or self._queue.parked:
+                self._reap(wait=True)
+                self.flush()
+
+    def _reap(self, *, wait: bool) -> None:
+        still_running: list[Future] = []
+        for fut in self._futures:
+            if wait or fut.done():
+                fut.result()
+            else:
+                still_running.append(fut)
+        self._futures = still_running
+
+    def _release_slot(self) -> None:
+        with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _commit(self, refs: list[object], ticket: Future) -> None:
+        job = _CommitJob(refs, page_size=self.page_size, concurrency=self.concurrency)
+        try:
+            while not job.done:
+                chunk = job.next_chunk()
+                try:
+                    _delete_batch(self._db, chunk).commit()
+                except _RETRYABLE_RPC_ERRORS as exc:
+                    time.sleep(job.retry_delay(exc))
+                    continue
+                job.committed(chunk)
+        except BaseException as exc:
+            ticket.set_exception(exc)
+            raise
+        else:
+            # Resolved before this future completes, so `drain` sees freed parents.
+            ticket.set_result(None)
+        finally:
+            self._release_slot()
+
+
+def _read_page(cursor: _PageCursor) -> list[object]:
+    """Read the next page at `cursor`, retrying transient errors."""
+
+    while True:
+        size = cursor.size
+        try:
+            docs = list(cursor.query(size).stream())
+        except _RETRYABLE_RPC_ERRORS as exc:
+            time.sleep(cursor.retry_delay(exc))
+            continue
+        cursor.advance(docs, size)
+        return docs
+
+
+def _iter_pages(
+    collection_ref,
+    *,
+    page_size: int,
+    tuner: _AimdLimit | None = None,
+    stream: bool = False,
+) -> Iterable[list[object]]:
+    """Yield pages of documents from a collection, walking it once by document name.
+
+    See `_PageCursor` for how pages are sized, resumed and retried.
+    """
+
+    cursor = _PageCursor(collection_ref, page_size=page_size, tuner=tuner, stream=stream)
+    if not stream:
+        while not cursor.finished:
+            docs = _read_page(cursor)
+            if docs:
+                yield docs
+        return
+
+    while not cursor.finished:
+        docs_iter = iter(cursor.query().stream())
+        try:
+            while not cursor.finished:
+                size = cursor.size
+                docs = list(itertools.islice(docs_iter, size))
+                cursor.advance(docs, size)
+                if docs:
+                    yield docs
+        except _RETRYABLE_RPC_ERRORS as exc:
+            time.sleep(cursor.retry_delay(exc))
+
+
+def _delete_document_recursive(
+    doc_ref,
+    *,
+    deleter: _BatchDeleter,
+    known_subcollections: tuple[str, ...] | None = None,
+) -> int:
+    """Delete a document and all subcollections.
+
+    Deletes are queued on `deleter`. Returns number of documents deleted
+    (including nested docs and the doc itself).
+    """
+
+    steps = _delete_tree_steps(doc_ref, tuner=deleter.page_size, known_subcollections=known_subcollections)
+    reply = None
+    while True:
+        try:
+            step = steps.send(reply)
+        except StopIteration as done:
+            return done.value
+        if step[0] == "page":
+            reply = _read_page(step[1])
+        elif step[0] == "collections":
+            reply = list(step[1].collections())
+        else:
+            reply = deleter.add(step[1], after=step[2])
+
+
+_WS_RX = re.compile(r"\s+")
+_BAD_CHAR_RX = re.compile(r"[^a-z0-9_\-]")
+_BOT_KEY_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_-")
+
+
+@functools.lru_cache(maxsize=128)
 def _sanitize_bot_key(value: str) -> str:
     # Keep behavior aligned with FirestoreChannelMemoryStore._sanitize_bot_key
-    import re
-
     t = (value or "").strip().lower()
-    t = re.sub(r"\s+", "_", t)
-    t = re.sub(r"[^a-z0-9_\-]", "", t)
+    t = _WS_RX.sub("_", t)
+    t = _BAD_CHAR_RX.sub("", t)
     return t or "bot"
 
 
+@functools.lru_cache(maxsize=16)
 def _build_channel_memory_matcher(
     *,
     prefix: str,
@@ -82,18 +557,123 @@ def _build_channel_memory_matcher(
     Note: bot_key itself may contain underscores/hyphens.
     """
 
-    import re
-
     # Bot key must be sanitized to match stored ids.
-    bot_pat = re.escape(_sanitize_bot_key(bot_key)) if bot_key else r"[-a-z0-9_]+"
+    bot = _sanitize_bot_key(bot_key) if bot_key else None
 
     # If an id is provided, it must match exactly.
-    gid_pat = re.escape(str(int(guild_id))) if isinstance(guild_id, int) and guild_id > 0 else r"\d+"
-    cid_pat = re.escape(str(int(channel_id))) if isinstance(channel_id, int) and channel_id > 0 else r"\d+"
-    uid_pat = re.escape(str(int(user_id))) if isinstance(user_id, int) and user_id > 0 else r"\d+"
+    gid_s = str(int(guild_id)) if isinstance(guild_id, int) and guild_id > 0 else None
+    cid_s = str(int(channel_id)) if isinstance(channel_id, int) and channel_id > 0 else None
+    uid_s = str(int(user_id)) if isinstance(user_id, int) and user_id > 0 else None
+
+    plen = len(prefix)
+
+    def match(doc_id: str) -> bool:
+        if not doc_id.startswith(prefix):
+            return False
+        # The three trailing ids are numeric (no underscores), so splitting from the
+        # right leaves the whole bot key (which may contain underscores) in `bk`.
+        parts = doc_id[plen:].rsplit("_", 3)
+        if len(parts) != 4:
+            return False
+        bk, g, c, u = parts
+        if not (g.isdecimal() and c.isdecimal() and u.isdecimal()):
+            return False
+        if bot is not None:
+            if bk != bot:
+                return False
+        elif not bk or not _BOT_KEY_CHARS.issuperset(bk):
+            return False
+        if gid_s is not None and g != gid_s:
+            return False
+        if cid_s is not None and c != cid_s:
+            return False
+        if uid_s is not None and u != uid_s:
+            return False
+        return True
+
+    return match
+
+
+def _channel_memory_query(collection_ref, *, prefix: str, bot_key: str | None):
+    """Restrict `collection_ref` to document ids starting with the channel-memory prefix.
+
+    This is a server-side document-id range, so non-matching docs (admin keys, user
+    profiles, other bots) are never read. Callers still apply the full id matcher.
+    """
+
+    low = prefix + (f"{_sanitize_bot_key(bot_key)}_" if bot_key else "")
+    return collection_ref.where(_DOC_ID_FIELD, ">=", collection_ref.document(low)).where(
+        _DOC_ID_FIELD, "<", collection_ref.document(low + "\uf8ff")
+    )
+
+
+def _is_wipe_candidate(doc_id, *, match_doc_id: Callable[[str], bool], protected_doc_ids: set[str]) -> bool:
+    """Whether a doc id is one this run deletes (shared by every scan and delete path)."""
+
+    if not isinstance(doc_id, str) or not doc_id:
+        return False
+    return doc_id not in protected_doc_ids and match_doc_id(doc_id)
+
+
+def _iter_matching_snapshots(
+    collection_ref,
+    *,
+    match_doc_id: Callable[[str], bool],
+    protected_doc_ids: set[str],
+    page_size: int = 200,
+    tuner: _AimdLimit | None = None,
+    stream: bool = False,
+) -> Iterable[object]:
+    """Yield snapshots whose ids match, skipping protected docs (shared by scan and delete)."""
+
+    for docs in _iter_pages(
+        collection_ref, page_size=max(1, int(page_size)), tuner=tuner, stream=stream
+    ):
+        for snap in docs:
+            if _is_wipe_candidate(
+                getattr(snap, "id", ""), match_doc_id=match_doc_id, protected_doc_ids=protected_doc_ids
+            ):
+                yield snap
+
+
+def _iter_matching_doc_refs(
+    collection_ref,
+    *,
+    match_doc_id: Callable[[str], bool],
+    protected_doc_ids: set[str],
+    page_size: int = 200,
+    tuner: _AimdLimit | None = None,
+    include_missing: bool = False,
+    stream: bool = False,
+) -> Iterable[object]:
+    """Yield refs of matching docs.
+
+    With `include_missing`, `collection_ref` must be a collection (not a query) and is
+    enumerated with `list_documents()`, whose ListDocuments call sets show_missing. That
+    also yields "missing" docs that have no fields of their own but still hold
+    subcollections (e.g. recent_messages left behind after the parent was deleted),
+    which queries never return. It pages over every doc id in the collection, so
+    it is opt-in.
+    """
 
-    rx = re.compile(rf"^{re.escape(prefix)}{bot_pat}_{gid_pat}_{cid_pat}_{uid_pat}$")
-    return lambda doc_id: bool(rx.match(doc_id))
+    if include_missing and hasattr(collection_ref, "list_documents"):
+        size = tuner.value if tuner is not None else max(1, int(page_size))
+        for ref in collection_ref.list_documents(page_size=size):
+            if _is_wipe_candidate(
+                getattr(ref, "id", ""), match_doc_id=match_doc_id, protected_doc_ids=protected_doc_ids
+            ):
+                yield ref
+        return
+
+    for snap in _iter_matching_snapshots(
+        collection_ref,
+        match_doc_id=match_doc_id,
+        protected_doc_ids=protected_doc_ids,
+        page_size=page_size,
+        tuner=tuner,
+        stream=stream,
+    ):
+        yield snap.reference
 
 
 def _scan_collection_for_matches(
@@ -102,21 +682,48 @@ def _scan_collection_for_matches(
     match_doc_id: Callable[[str], bool],
     protected_doc_ids: set[str],
     sample_limit: int = 25,
-) -> tuple[int, list[str]]:
+    count_server_side: bool = False,
+    include_missing: bool = False,
+) -> tuple[int, list[str], bool]:
+    """Return (count, up to `sample_limit` matching ids, whether the count is exact).
+
+    With `count_server_side`, `collection_ref` should be the id-range query with no extra
+    guild/channel/user narrowing. The total then comes from a single count() aggregation,
+    and sampling stops as soon as `sample_limit` matching ids have been seen (normally
+    within the first small page). That total is only an upper bound: the range also
+    holds ids the matcher rejects (malformed ids, or other bots whose key starts with
+    `<bot_key>_`), and those are never deleted.
+    """
+
+    if count_server_side:
+        try:
+            matched = int(collection_ref.count().get()[0][0].value)
+        except AttributeError:
+            pass  # google-cloud-firestore without aggregation queries: scan instead
+        else:
+            first_matches = itertools.islice(
+                _iter_matching_snapshots(
+                    collection_ref,
+                    match_doc_id=match_doc_id,
+                    protected_doc_ids=protected_doc_ids,
+                    page_size=max(1, int(sample_limit)) * 4,
+                ),
+                sample_limit,
+            )
+            return matched, [snap.id for snap in first_matches], False
+
     matched = 0
     samples: list[str] = []
-    for snap in collection_ref.stream():
-        doc_id = getattr(snap, "id", "")
-        if not isinstance(doc_id, str) or not doc_id:
-            continue
-        if doc_id in protected_doc_ids:
-            continue
-        if not match_doc_id(doc_id):
-            continue
+    for ref in _iter_matching_doc_refs(
+        collection_ref,
+        match_doc_id=match_doc_id,
+        protected_doc_ids=protected_doc_ids,
+        include_missing=include_missing,
+    ):
         matched += 1
         if len(samples) < sample_limit:
-            samples.append(doc_id)
-    return matched, samples
+            samples.append(ref.id)
+    return matched, samples, True
 
 
 def _delete_matches_in_collection(
@@ -124,61 +731,360 @@ def _delete_matches_in_collection(
     collection_ref,
     match_doc_id: Callable[[str], bool],
     protected_doc_ids: set[str],
-    page_size: int = 200,
+    deleter: _BatchDeleter,
+    known_subcollections: tuple[str, ...] | None = None,
+    walkers: int = 8,
+    include_missing: bool = False,
+    stream: bool = False,
 ) -> int:
     """Delete matching documents (and nested subcollections) under a collection.
 
-    We intentionally do this via repeated scans + limit(page_size) so the tool is
-    robust for large collections without holding all doc refs in memory.
+    The collection is walked once in cursor-paginated pages, so the tool stays robust
+    for large collections without holding all doc refs in memory and without
+    re-scanning documents it has already looked at. Pages are sized by the deleter's
+    page-size limit.
+
+    The calling thread only scans; each matched doc's tree is walked on one of `walkers`
+    threads, which feed the shared deleter. At most `_MAX_QUEUED_MATCHES` docs wait to be
+    walked, so the scan never runs far ahead of the deletes. Batches from different
+    walkers commit concurrently, but a parent is never committed before its children.
+
+    `include_missing` also deletes orphaned subcollections; see `_iter_matching_doc_refs`.
+    `stream` scans the collection with one unbounded query; see `_iter_pages`.
     """
 
     deleted = 0
+    queued: deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max(1, int(walkers)), thread_name_prefix="wipe-walk") as walk_pool:
+        try:
+            for doc_ref in _iter_matching_doc_refs(
+                collection_ref,
+                match_doc_id=match_doc_id,
+                protected_doc_ids=protected_doc_ids,
+                tuner=deleter.page_size,
+                include_missing=include_missing,
+                stream=stream,
+            ):
+                queued.append(
+                    walk_pool.submit(
+                        _delete_document_recursive,
+                        doc_ref,
+                        deleter=deleter,
+                        known_subcollections=known_subcollections,
+                    )
+                )
+                while queued and (len(queued) >= _MAX_QUEUED_MATCHES or queued[0].done()):
+                    deleted += queued.popleft().result()
+            while queued:
+                deleted += queued.popleft().result()
+        except BaseException:
+            # Don't start walking (and deleting) more trees after a failure.
+            for fut in queued:
+                fut.cancel()
+            raise
+
+    deleter.drain()
+    return deleted
 
-    # Each loop: pick up to N documents, delete those that match. Repeat until no
-    # matching docs are found in the scanned window.
-    while True:
-        docs = list(collection_ref.limit(max(1, int(page_size))).stream())
-        if not docs:
-            return deleted
 
-        progress = 0
-        for snap in docs:
-            doc_id = getattr(snap, "id", "")
-            if not isinstance(doc_id, str) or not doc_id:
-                continue
-            if doc_id in protected_doc_ids:
-                continue
-            if not match_doc_id(doc_id):
-                continue
+class _AsyncBatchDeleter:
+    """asyncio counterpart of `_BatchDeleter` for an `AsyncClient` (used by --async).
 
-            deleted += _delete_document_recursive(snap.reference)
-            progress += 1
+    Commits run as tasks on one event loop instead of pool threads; the same AIMD limits
+    bound how many are in flight and how large each batch is.
+    """
 
-        # If we scanned a page and didn't delete anything, it likely means the
-        # matching docs are outside the first page. Fall back to a full stream.
-        if progress == 0:
-            remaining: list[object] = []
-            for snap in collection_ref.stream():
-                doc_id = getattr(snap, "id", "")
-                if not isinstance(doc_id, str) or not doc_id:
-                    continue
-                if doc_id in protected_doc_ids:
+    def __init__(self, db, *, concurrency: _AimdLimit, page_size: _AimdLimit) -> None:
+        self._db = db
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self._slots = asyncio.Condition()
+        self._in_flight = 0
+        self._queue = _BatchQueue(page_size)
+        self._tasks: list[asyncio.Task] = []
+
+    async def add(self, doc_ref, *, after: Iterable[Future] = ()) -> Future:
+        ticket, full = self._queue.add(doc_ref, after)
+        if full:
+            await self.flush()
+        return ticket
+
+    async def flush(self) -> None:
+        batch = self._queue.take()
+        if batch is None:
+            return
+        refs, ticket = batch
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self.concurrency.value)
+            self._in_flight += 1
+        self._tasks.append(asyncio.create_task(self._commit(refs, ticket)))
+        # Surface failures early and keep the task list short.
+        still_running: list[asyncio.Task] = []
+        for task in self._tasks:
+            if task.done():
+                task.result()
+            else:
+                still_running.append(task)
+        self._tasks = still_running
+
+    async def drain(self) -> None:
+        await self.flush()
+        while self._tasks or self._queue.parked:
+            tasks, self._tasks = self._tasks, []
+            await asyncio.gather(*tasks)
+            await self.flush()
+
+    async def cancel(self) -> None:
+        """Drop queued deletes and cancel (and wait out) outstanding commits."""
+
+        self._queue.clear()
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _commit(self, refs: list[object], ticket: Future) -> None:
+        job = _CommitJob(refs, page_size=self.page_size, concurrency=self.concurrency)
+        try:
+            while not job.done:
+                chunk = job.next_chunk()
+                try:
+                    await _delete_batch(self._db, chunk).commit()
+                except _RETRYABLE_RPC_ERRORS as exc:
+                    await asyncio.sleep(job.retry_delay(exc))
                     continue
-                if match_doc_id(doc_id):
-                    remaining.append(snap)
-                    if len(remaining) >= max(1, int(page_size)):
-                        break
+                job.committed(chunk)
+        except BaseException as exc:
+            ticket.set_exception(exc)
+            raise
+        else:
+            ticket.set_result(None)
+        finally:
+            async with self._slots:
+                self._in_flight -= 1
+                self._slots.notify_all()
+
+
+async def _aread_page(cursor: _PageCursor) -> list[object]:
+    """Async version of `_read_page`."""
+
+    while True:
+        size = cursor.size
+        try:
+            docs = [doc async for doc in cursor.query(size).stream()]
+        except _RETRYABLE_RPC_ERRORS as exc:
+            await asyncio.sleep(cursor.retry_delay(exc))
+            continue
+        cursor.advance(docs, size)
+        return docs
+
+
+async def _aiter_pages(
+    collection_ref, *, tuner: _AimdLimit, stream: bool = False
+) -> AsyncIterator[list[object]]:
+    """Async version of `_iter_pages` (pages sized by `tuner`)."""
+
+    cursor = _PageCursor(collection_ref, page_size=tuner.value, tuner=tuner, stream=stream)
+    if not stream:
+        while not cursor.finished:
+            docs = await _aread_page(cursor)
+            if docs:
+                yield docs
+        return
+
+    while not cursor.finished:
+        size = cursor.size
+        docs: list[object] = []
+        try:
+            async for doc in cursor.query().stream():
+                docs.append(doc)
+                if len(docs) >= size:
+                    cursor.advance(docs, size)
+                    yield docs
+                    size = cursor.size
+                    docs = []
+            # The tail (possibly empty) is a short page and ends the walk.
+            cursor.advance(docs, size)
+        except _RETRYABLE_RPC_ERRORS as exc:
+            await asyncio.sleep(cursor.retry_delay(exc))
+            continue
+        if docs:
+            yield docs
+
+
+async def _adelete_document_recursive(
+    doc_ref,
+    *,
+    deleter: _AsyncBatchDeleter,
+    known_subcollections: tuple[str, ...] | None = None,
+) -> int:
+    """Async version of `_delete_document_recursive` (same `_delete_tree_steps` plan)."""
+
+    steps = _delete_tree_steps(doc_ref, tuner=deleter.page_size, known_subcollections=known_subcollections)
+    reply = None
+    while True:
+        try:
+            step = steps.send(reply)
+        except StopIteration as done:
+            return done.value
+        if step[0] == "page":
+            reply = await _aread_page(step[1])
+        elif step[0] == "collections":
+            reply = [subcoll async for subcoll in step[1].collections()]
+        else:
+            reply = await deleter.add(step[1], after=step[2])
+
+
+async def _adelete_matches_in_collection(
+    *,
+    collection_ref,
+    match_doc_id: Callable[[str], bool],
+    protected_doc_ids: set[str],
+    deleter: _AsyncBatchDeleter,
+    known_subcollections: tuple[str, ...] | None = None,
+    walkers: int = 8,
+    include_missing: bool = False,
+    stream: bool = False,
+) -> int:
+    """Async version of `_delete_matches_in_collection`.
+
+    Matched trees are walked as tasks, at most `walkers` at a time, while the scan keeps
+    paging; everything shares one event loop and one AsyncClient channel.
+    """
+
+    async def matching_refs() -> AsyncIterator[object]:
+        if include_missing and hasattr(collection_ref, "list_documents"):
+            refs = collection_ref.list_documents(page_size=deleter.page_size.value)
+        else:
+            refs = (
+                snap.reference
+                async for docs in _aiter_pages(collection_ref, tuner=deleter.page_size, stream=stream)
+                for snap in docs
+            )
+        async for ref in refs:
+            if _is_wipe_candidate(
+                getattr(ref, "id", ""), match_doc_id=match_doc_id, protected_doc_ids=protected_doc_ids
+            ):
+                yield ref
+
+    walk_slots = asyncio.Semaphore(max(1, int(walkers)))
+
+    async def walk(doc_ref) -> int:
+        try:
+            return await _adelete_document_recursive(
+                doc_ref, deleter=deleter, known_subcollections=known_subcollections
+            )
+        finally:
+            walk_slots.release()
+
+    deleted = 0
+    walks: list[asyncio.Task] = []
+    try:
+        async for doc_ref in matching_refs():
+            await walk_slots.acquire()
+            walks.append(asyncio.create_task(walk(doc_ref)))
+            still_running: list[asyncio.Task] = []
+            for task in walks:
+                if task.done():
+                    deleted += task.result()
+                else:
+                    still_running.append(task)
+            walks = still_running
+        deleted += sum(await asyncio.gather(*walks))
+    except BaseException:
+        # Don't keep walking (and deleting) trees after a failure; wait for the cancelled
+        # tasks so none are left pending when the loop closes.
+        for task in walks:
+            task.cancel()
+        await asyncio.gather(*walks, return_exceptions=True)
+        await deleter.cancel()
+        raise
+
+    await deleter.drain()
+    return deleted
+
 
-            if not remaining:
-                return deleted
+async def _wipe_async(
+    *,
+    credentials_path: Path,
+    collection: str,
+    prefix: str,
+    bot_key: str | None,
+    match_doc_id: Callable[[str], bool],
+    protected_doc_ids: set[str],
+    concurrency: _AimdLimit,
+    page_size: _AimdLimit,
+    known_subcollections: tuple[str, ...] | None,
+    walkers: int,
+    include_missing: bool,
+    stream: bool,
+) -> int:
+    """Run the delete phase on an `AsyncClient` built from the same service account."""
+
+    cert = credentials.Certificate(str(credentials_path))
+    db = AsyncClient(project=cert.project_id, credentials=cert.get_credential())
+    try:
+        top = db.collection(collection)
+        source = top if include_missing else _channel_memory_query(top, prefix=prefix, bot_key=bot_key)
+        return await _adelete_matches_in_collection(
+            collection_ref=source,
+            match_doc_id=match_doc_id,
+            protected_doc_ids=protected_doc_ids,
+            deleter=_AsyncBatchDeleter(db, concurrency=concurrency, page_size=page_size),
+            known_subcollections=known_subcollections,
+            walkers=walkers,
+            include_missing=include_missing,
+            stream=stream,
+        )
+    finally:
+        await _aclose_client(db)
+
+
+async def _aclose_client(db) -> None:
+    """Close an AsyncClient's gRPC channel.
+
+    Newer google-cloud-firestore releases expose `close()` on the client; older ones only
+    on the underlying transport.
+    """
 
-            for snap in remaining:
-                deleted += _delete_document_recursive(snap.reference)
+    close = getattr(db, "close", None)
+    if close is None:
+        transport = getattr(getattr(db, "_firestore_api", None), "transport", None)
+        close = getattr(transport, "close", None)
+    if close is None:
+        return
+    result = close()
+    if inspect.isawaitable(result):
+        await result
 
 
 def _read_service_project_id(credentials_path: Path) -> str | None:
     try:
-        raw = json.loads(credentials_path.read_text(encoding="utf-8"))
+        path = credentials_path.resolve()
+        return _read_service_project_id_cached(path, path.stat().st_mtime_ns)
+    except OSError:
+        return None
+
+
+_PROJECT_ID_RX = re.compile(rb'"project_id"\s*:\s*"([^"\\]+)"')
+
+
+@functools.lru_cache(maxsize=8)
+def _read_service_project_id_cached(path: Path, mtime_ns: int) -> str | None:
+    # mtime_ns is part of the cache key only, so a replaced credentials file is re-read.
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    # Pull the plain-string project_id straight from the bytes instead of decoding the
+    # whole file (mostly the private_key PEM); anything unusual falls back to a full parse.
+    m = _PROJECT_ID_RX.search(data)
+    if m is not None:
+        pid = m.group(1).decode("utf-8", "replace")
+        if pid.strip():
+            return pid
+    try:
+        raw = fast_json.loads(data)
     except Exception:
         return None
     pid = raw.get("project_id") if isinstance(raw, dict) else None
@@ -251,7 +1157,61 @@ def main() -> int:
         "--page-size",
         type=int,
         default=200,
-        help="Documents deleted per page (default: 200)",
+        help="Documents deleted per page (default: 200; the starting size with --adaptive)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=(
+            "Grow page size (up to 500) and concurrency (up to --max-concurrency) while commits succeed "
+            "and halve them when Firestore throttles (default: on)"
+        ),
+    )
+    parser.add_argument(
+        "--known-subcollections",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help=(
+            "Only delete these subcollections under each matched doc (e.g. recent_messages) and treat "
+            "their docs as leaves. Saves one subcollection-listing RPC per document; by default every "
+            "subcollection is discovered recursively."
+        ),
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help=(
+            "Maximum batch commits (up to 500 deletes each) in flight at once, and the number of "
+            "threads walking matched docs' subcollections (default: 16)"
+        ),
+    )
+    parser.add_argument(
+        "--include-orphans",
+        action="store_true",
+        help=(
+            "Also delete subcollections (e.g. recent_messages) whose parent channel-memory doc no longer "
+            "exists. Lists every doc id in the collection instead of only the prefix range."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Scan the collection with one long-lived query instead of one query per page "
+            "(fewer round-trips; reopened after the last doc seen if the stream breaks)"
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help=(
+            "Run the delete phase on a single asyncio event loop with Firestore's AsyncClient instead of "
+            "worker threads (cheaper per request at high --max-concurrency)"
+        ),
     )
     parser.add_argument(
         "--yes",
@@ -306,12 +1266,10 @@ def main() -> int:
     if args.user_id:
         print(f"User filter: {int(args.user_id)}")
 
-    # Connect.
-    _init_firebase(credentials_path=credentials_path)
-    from firebase_admin import firestore  # imported after init to match other modules
-
-    db = firestore.client()
+    # Connect. One client (and one gRPC channel) is shared by the scan and every commit worker.
+    db = _firestore_client(credentials_path=credentials_path)
     top = db.collection(collection)
+    candidates = _channel_memory_query(top, prefix=prefix, bot_key=args.bot_key)
 
     protected_doc_ids = {admin_keys_doc, "admin_keys"}
     match_doc_id = _build_channel_memory_matcher(
@@ -322,13 +1280,33 @@ def main() -> int:
         user_id=args.user_id,
     )
 
-    matched, samples = _scan_collection_for_matches(
-        collection_ref=top,
+    # count() over the id range is a usable upper bound only when no guild/channel/user
+    # filter narrows the matches further and no protected doc falls inside the range.
+    range_low = prefix + (f"{_sanitize_bot_key(args.bot_key)}_" if args.bot_key else "")
+    count_in_range = not (args.guild_id or args.channel_id or args.user_id) and not any(
+        doc_id.startswith(range_low) for doc_id in protected_doc_ids
+    )
+    # Missing (orphan) parents never show up in queries, so they need the full listing.
+    source = top if args.include_orphans else candidates
+    if args.include_orphans:
+        print("Including orphaned subcollections (parent doc missing)")
+
+    matched, samples, exact = _scan_collection_for_matches(
+        collection_ref=source,
         match_doc_id=match_doc_id,
         protected_doc_ids=protected_doc_ids,
+        count_server_side=count_in_range and not args.include_orphans,
+        include_missing=args.include_orphans,
     )
 
-    print(f"\nMatched channel-memory docs: {matched}")
+    if exact:
+        print(f"\nMatched channel-memory docs: {matched}")
+    else:
+        print(f"\nChannel-memory docs in id range: at most {matched}")
+        print(
+            "(server-side count; ids in the range that don't match, such as malformed ids or other bots "
+            "whose key starts with this one, are included here but never deleted)"
+        )
     if samples:
         print("Sample ids:")
         for s in samples:
@@ -339,12 +1317,55 @@ def main() -> int:
         print("Re-run with --yes to actually delete matched channel-memory docs.")
         return 0
 
-    deleted = _delete_matches_in_collection(
-        collection_ref=top,
-        match_doc_id=match_doc_id,
-        protected_doc_ids=protected_doc_ids,
-        page_size=max(1, int(args.page_size)),
-    )
+    max_concurrency = max(1, int(args.max_concurrency))
+    page_size = max(1, int(args.page_size))
+    if args.adaptive:
+        concurrency_limit = _AimdLimit(max_concurrency, floor=1, ceiling=max_concurrency)
+        page_size_limit = _AimdLimit(
+            page_size,
+            floor=min(_MIN_PAGE_SIZE, page_size),
+            ceiling=max(_MAX_BATCH_DELETES, page_size),
+            step=_PAGE_SIZE_STEP,
+        )
+    else:
+        concurrency_limit = _AimdLimit.fixed(max_concurrency)
+        page_size_limit = _AimdLimit.fixed(page_size)
+
+    known_subcollections = tuple(args.known_subcollections) if args.known_subcollections else None
+
+    if args.use_async:
+        deleted = asyncio.run(
+            _wipe_async(
+                credentials_path=credentials_path,
+                collection=collection,
+                prefix=prefix,
+                bot_key=args.bot_key,
+                match_doc_id=match_doc_id,
+                protected_doc_ids=protected_doc_ids,
+                concurrency=concurrency_limit,
+                page_size=page_size_limit,
+                known_subcollections=known_subcollections,
+                walkers=max_concurrency,
+                include_missing=args.include_orphans,
+                stream=args.stream,
+            )
+        )
+        print(f"\nDone. Deleted {deleted} documents (including nested subcollection docs).")
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="wipe") as executor:
+        deleted = _delete_matches_in_collection(
+            collection_ref=source,
+            match_doc_id=match_doc_id,
+            protected_doc_ids=protected_doc_ids,
+            deleter=_BatchDeleter(
+                db, executor=executor, concurrency=concurrency_limit, page_size=page_size_limit
+            ),
+            known_subcollections=known_subcollections,
+            walkers=max_concurrency,
+            include_missing=args.include_orphans,
+            stream=args.stream,
+        )
 
     print(f"\nDone. Deleted {deleted} documents (including nested subcollection docs).")
     return 0